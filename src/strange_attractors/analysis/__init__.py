@@ -0,0 +1,10 @@
+from .basins import BasinEngine, BasinSettings
+from .bifurcation import BifurcationEngine, BifurcationResult, BifurcationSettings
+
+__all__ = [
+    "BasinEngine",
+    "BasinSettings",
+    "BifurcationEngine",
+    "BifurcationResult",
+    "BifurcationSettings",
+]
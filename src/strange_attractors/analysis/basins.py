@@ -0,0 +1,150 @@
+"""Basin-of-attraction maps.
+
+Every pixel of a 2D grid is an initial condition; its label is the index of the end state the
+particle settles at (-1 if it did not settle within `max_steps`), stored in the smallest integer
+dtype that fits all end states. The grid is split into square tiles which are integrated as one
+vectorized batch each and spread over a process pool. Only a few tiles per worker are in flight at
+a time, and labels are written tile by tile into a memory-mapped .npy file, so the full image never
+has to fit in RAM.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from strange_attractors.attractors import BasinAttractor
+from strange_attractors.solvers.newton import NewtonSolver
+from strange_attractors.solvers.solver import Solver
+
+Tile = tuple[int, int, int, int]  # row_start, row_stop, col_start, col_stop
+
+# Tiles submitted per worker before waiting for results, keeps workers busy without queueing the
+# whole grid
+TILES_IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass
+class BasinSettings:
+    extent: tuple[float, float, float, float] = (-2.0, 2.0, -2.0, 2.0)  # x_min, x_max, y_min, y_max
+    resolution: tuple[int, int] = (1000, 1000)  # width, height in pixels
+    dt: float = 0.01
+    max_steps: int = 20000
+    check_every: int = 50  # Steps per solver call, after each call settled particles are dropped
+    tile_size: int = 128  # Edge length of a square tile in pixels
+    n_workers: int | None = None  # None = one per CPU, 1 = run in this process
+
+
+class BasinEngine:
+    """Computes the basin map of a BasinAttractor over a 2D grid of initial conditions."""
+
+    def __init__(
+        self,
+        attractor: BasinAttractor,
+        settings: BasinSettings,
+        solver_cls: type[Solver] = NewtonSolver,
+    ):
+        self.attractor = attractor
+        self.settings = settings
+        self.solver_cls = solver_cls
+
+    def tiles(self) -> list[Tile]:
+        width, height = self.settings.resolution
+        size = self.settings.tile_size
+        return [
+            (row, min(row + size, height), col, min(col + size, width))
+            for row in range(0, height, size)
+            for col in range(0, width, size)
+        ]
+
+    def run(self, output: str | Path) -> np.memmap:
+        """Computes the basin map and stores it as .npy file at `output`.
+
+        Returns the label image as memory-mapped array of shape (height, width). Row 0
+        corresponds to y_min, column 0 to x_min.
+        """
+        width, height = self.settings.resolution
+        dtype = label_dtype(self.attractor.n_end_states)
+        labels = np.lib.format.open_memmap(output, mode="w+", dtype=dtype, shape=(height, width))
+        tiles = self.tiles()
+        n_workers = self.settings.n_workers or os.cpu_count() or 1
+
+        if n_workers == 1:
+            for tile in tiles:
+                _write_tile(
+                    labels, tile, _solve_tile(self.attractor, self.solver_cls, self.settings, tile)
+                )
+        else:
+            max_in_flight = TILES_IN_FLIGHT_PER_WORKER * n_workers
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                pending: dict[Future, Tile] = {}
+                for tile in tiles:
+                    if len(pending) >= max_in_flight:
+                        _write_done(labels, pending)
+                    future = pool.submit(
+                        _solve_tile, self.attractor, self.solver_cls, self.settings, tile
+                    )
+                    pending[future] = tile
+                while pending:
+                    _write_done(labels, pending)
+
+        labels.flush()
+        return labels
+
+
+def label_dtype(n_end_states: int) -> np.dtype:
+    """Smallest signed integer dtype holding the labels -1 to n_end_states - 1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_end_states - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    raise ValueError(f"Too many end states: {n_end_states}")
+
+
+def _write_done(labels: np.memmap, pending: dict[Future, Tile]):
+    """Waits for finished tiles, writes them and drops their futures along with their labels."""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        _write_tile(labels, pending.pop(future), future.result())
+
+
+def _write_tile(labels: np.memmap, tile: Tile, tile_labels: np.ndarray):
+    row_start, row_stop, col_start, col_stop = tile
+    labels[row_start:row_stop, col_start:col_stop] = tile_labels
+
+
+def _solve_tile(
+    attractor: BasinAttractor, solver_cls: type[Solver], settings: BasinSettings, tile: Tile
+) -> np.ndarray:
+    """Integrates all initial conditions of one tile until they settle.
+
+    Settled particles are dropped from the batch, so the tile finishes as soon as its
+    slowest particle has settled.
+    """
+    row_start, row_stop, col_start, col_stop = tile
+    width, height = settings.resolution
+    x_min, x_max, y_min, y_max = settings.extent
+    xs = np.linspace(x_min, x_max, width)[col_start:col_stop]
+    ys = np.linspace(y_min, y_max, height)[row_start:row_stop]
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    points = np.stack((grid_x.ravel(), grid_y.ravel()), axis=1)
+
+    solver = solver_cls(attractor)
+    state = attractor.initial_states(points)
+    labels = np.full(len(points), -1, dtype=label_dtype(attractor.n_end_states))
+    active = np.arange(len(points))
+
+    for start in range(0, settings.max_steps, settings.check_every):
+        n_steps = min(settings.check_every, settings.max_steps - start)
+        # solve() includes the starting state
+        state = solver.solve(state, n_steps + 1, settings.dt)[:, -1]
+        settled_at = attractor.classify(state)
+        settled = settled_at >= 0
+        labels[active[settled]] = settled_at[settled]
+        active = active[~settled]
+        state = state[~settled]
+        if len(active) == 0:
+            break
+
+    return labels.reshape(row_stop - row_start, col_stop - col_start)
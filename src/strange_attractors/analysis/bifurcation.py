@@ -0,0 +1,282 @@
+"""Bifurcation diagrams for one-parameter sweeps.
+
+Instead of one attractor per parameter value, a batch of values is integrated as a single
+vectorized attractor whose parameter is an array with one entry per particle. Batches are spread
+over a process pool and integrated in chunks of steps: the warm-up is discarded and only the
+extracted points (local maxima of one coordinate, or crossings of a Poincaré section) are kept,
+so memory does not grow with the number of steps.
+
+This requires the attractor's vector_field to broadcast the swept parameter as one value per
+particle, i.e. to combine it with (N,) columns of the state only. The engine checks this once
+against per-value scalar calls before sweeping.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from strange_attractors.attractors import Attractor
+from strange_attractors.solvers.newton import NewtonSolver
+from strange_attractors.solvers.solver import Solver
+from strange_attractors.visu.raster import density_image, rasterize, save_image
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+@dataclass
+class BifurcationSettings:
+    dt: float = 0.03
+    n_warmup: int = 5000  # Steps discarded before extraction starts
+    n_steps: int = 20000  # Steps used for extraction
+    chunk_steps: int = 1000  # Steps integrated at once, bounds the memory per batch
+    values_per_batch: int = 250  # Parameter values integrated as one vectorized batch
+    n_particles: int = 1  # Starting states per parameter value
+    coordinate: int = 0  # Coordinate whose values are plotted
+    mode: str = "maxima"  # "maxima" of the coordinate or "section" crossings
+    section_coordinate: int = 2  # Section mode: coordinate defining the section plane
+    section_value: float = 0.0  # Section mode: position of the section plane
+    n_workers: int | None = None  # None = one per CPU, 1 = run in this process
+    seed: int = 0  # Seed for the starting states
+
+
+@dataclass
+class BifurcationReport:
+    n_values: int
+    n_points: int
+    integration_steps: int  # Summed over all particles
+    elapsed: float  # Seconds
+    n_workers: int
+    peak_rss: int | None  # Measured peak resident memory of a single worker in bytes, if available
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.integration_steps / max(self.elapsed, 1e-12)
+
+    def __str__(self) -> str:
+        memory = "n/a" if self.peak_rss is None else f"{self.peak_rss / 2**20:.0f} MiB"
+        return (
+            f"{self.n_values} values, {self.n_points} points in {self.elapsed:.1f}s "
+            f"({self.steps_per_second / 1e6:.2f}M particle steps/s, "
+            f"peak RSS {memory} per worker x {self.n_workers} workers)"
+        )
+
+
+@dataclass
+class BifurcationResult:
+    parameters: np.ndarray  # Parameter value of each extracted point
+    values: np.ndarray  # Coordinate value of each extracted point
+    report: BifurcationReport
+
+    def render(
+        self,
+        path: str | Path,
+        *,
+        resolution: tuple[int, int] = (2000, 1000),
+        cmap: str = "inferno",
+        extent: tuple[float, float, float, float] | None = None,
+    ) -> np.ndarray:
+        """Rasterizes the diagram headlessly and saves it as image. Returns the RGB image.
+
+        The extent (param_min, param_max, value_min, value_max) defaults to the range of the
+        extracted points.
+        """
+        if extent is None:
+            if len(self.values) == 0:
+                raise ValueError(
+                    "No points were extracted, e.g. the section plane misses the attractor. "
+                    "Pass an explicit extent to render an empty diagram."
+                )
+            extent = (
+                self.parameters.min(),
+                self.parameters.max(),
+                self.values.min(),
+                self.values.max(),
+            )
+        counts = rasterize(self.parameters, self.values, resolution, extent)
+        image = density_image(counts, cmap)
+        save_image(path, image)
+        return image
+
+
+class BifurcationEngine:
+    """Sweeps one dataclass field of an attractor class over a range of values."""
+
+    def __init__(
+        self,
+        attractor_cls: type[Attractor],
+        parameter: str,
+        values: np.ndarray,
+        settings: BifurcationSettings,
+        solver_cls: type[Solver] = NewtonSolver,
+    ):
+        self.attractor_cls = attractor_cls
+        self.parameter = parameter
+        self.values = np.asarray(values, dtype=float)
+        self.settings = settings
+        self.solver_cls = solver_cls
+        if settings.mode not in {"maxima", "section"}:
+            raise ValueError(f"Unknown mode {settings.mode!r}, expected 'maxima' or 'section'")
+        self._check_vectorized()
+
+    def starting_states(self) -> np.ndarray:
+        """Starting states of shape (n_particles, n_dim), shared by all parameter values."""
+        n_dim = self.attractor_cls().n_dim
+        rng = np.random.default_rng(self.settings.seed)
+        return rng.normal(size=(self.settings.n_particles, n_dim))
+
+    def _check_vectorized(self):
+        """Checks that a batched vector_field matches per-value scalar calls.
+
+        Uses a particle count that differs from the state dimension, so a parameter that
+        broadcasts along the wrong axis either fails or gives different results.
+        """
+        n_check = 5
+        n_dim = self.attractor_cls().n_dim
+        values = np.resize(self.values, n_check) * (1 + 0.1 * np.arange(n_check))
+        states = np.random.default_rng(self.settings.seed).normal(size=(n_check, n_dim))
+        expected = np.concatenate(
+            [
+                self.attractor_cls(**{self.parameter: value}).vector_field(state[None])
+                for value, state in zip(values, states, strict=True)
+            ]
+        )
+        error = None
+        try:
+            batched = self.attractor_cls(**{self.parameter: values}).vector_field(states)
+            matches = batched.shape == expected.shape and np.allclose(batched, expected)
+        except (ValueError, IndexError, TypeError) as e:
+            matches, error = False, e
+        if not matches:
+            raise ValueError(
+                f"{self.attractor_cls.__name__}.vector_field does not support one value of "
+                f"{self.parameter!r} per particle, so it cannot be swept in batches"
+            ) from error
+
+    def run(self) -> BifurcationResult:
+        start = time.perf_counter()
+        settings = self.settings
+        starting_states = self.starting_states()
+        batches = [
+            self.values[i : i + settings.values_per_batch]
+            for i in range(0, len(self.values), settings.values_per_batch)
+        ]
+        jobs = [
+            _Batch(
+                self.attractor_cls,
+                self.parameter,
+                batch,
+                starting_states,
+                settings,
+                self.solver_cls,
+            )
+            for batch in batches
+        ]
+        n_workers = min(settings.n_workers or os.cpu_count() or 1, len(jobs))
+
+        if n_workers == 1:
+            results = [_solve_batch(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_solve_batch, jobs))
+
+        parameters = np.concatenate([result[0] for result in results])
+        values = np.concatenate([result[1] for result in results])
+        peak_rss = max(result[2] for result in results) if resource is not None else None
+        report = BifurcationReport(
+            n_values=len(self.values),
+            n_points=len(values),
+            integration_steps=len(self.values)
+            * settings.n_particles
+            * (settings.n_warmup + settings.n_steps),
+            elapsed=time.perf_counter() - start,
+            n_workers=n_workers,
+            peak_rss=peak_rss,
+        )
+        return BifurcationResult(parameters, values, report)
+
+
+@dataclass
+class _Batch:
+    attractor_cls: type[Attractor]
+    parameter: str
+    values: np.ndarray
+    starting_states: np.ndarray
+    settings: BifurcationSettings
+    solver_cls: type[Solver]
+
+
+def _solve_batch(batch: _Batch) -> tuple[np.ndarray, np.ndarray, int]:
+    """Integrates all starting states for a batch of parameter values.
+
+    Returns the parameter value and the coordinate value of every extracted point, and the
+    peak resident memory of this process in bytes (0 if it cannot be measured).
+    """
+    settings = batch.settings
+    n_particles = len(batch.starting_states)
+    particle_values = np.repeat(batch.values, n_particles)
+    attractor = batch.attractor_cls(**{batch.parameter: particle_values})
+    solver = batch.solver_cls(attractor)
+    state = np.tile(batch.starting_states, (len(batch.values), 1))
+
+    for n_steps in _chunks(settings.n_warmup, settings.chunk_steps):
+        state = solver.solve(state, n_steps + 1, settings.dt)[:, -1]
+
+    parameters, points = [], []
+    # Last two samples of the previous chunk, so extrema and crossings at chunk borders are found
+    tail = None
+    for n_steps in _chunks(settings.n_steps, settings.chunk_steps):
+        trajectory = solver.solve(state, n_steps + 1, settings.dt)
+        state = trajectory[:, -1]
+        window = trajectory if tail is None else np.concatenate((tail, trajectory[:, 1:]), axis=1)
+        particles, found = _extract(window, settings, skip_first=tail is not None)
+        parameters.append(particle_values[particles])
+        points.append(found)
+        tail = window[:, -2:]
+
+    return np.concatenate(parameters), np.concatenate(points), _peak_rss()
+
+
+def _peak_rss() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _extract(
+    window: np.ndarray, settings: BifurcationSettings, skip_first: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the points of interest in a window of shape (n_particles, n_steps, n_dim).
+
+    Returns the particle index and coordinate value of every point found.
+    """
+    series = window[:, :, settings.coordinate]
+    if settings.mode == "maxima":
+        # Interior points only; the last point is checked once the next chunk arrives
+        is_max = (series[:, 1:-1] > series[:, :-2]) & (series[:, 1:-1] >= series[:, 2:])
+        particles, steps = np.nonzero(is_max)
+        return particles, series[particles, steps + 1]
+    section = window[:, :, settings.section_coordinate] - settings.section_value
+    # Upward crossings between step t and t+1. The first pair of a continued window was
+    # already checked as the last pair of the previous one.
+    crossing = (section[:, :-1] < 0) & (section[:, 1:] >= 0)
+    if skip_first:
+        crossing[:, 0] = False
+    particles, steps = np.nonzero(crossing)
+    before, after = section[particles, steps], section[particles, steps + 1]
+    fraction = -before / (after - before)
+    start, end = series[particles, steps], series[particles, steps + 1]
+    return particles, start + fraction * (end - start)
+
+
+def _chunks(n_steps: int, chunk_steps: int) -> list[int]:
+    return [min(chunk_steps, n_steps - i) for i in range(0, n_steps, chunk_steps)]
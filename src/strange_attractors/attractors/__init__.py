@@ -1,6 +1,13 @@
-from .attractors import Attractor, SuperpositionAttractor
+from .attractors import Attractor, BasinAttractor, SuperpositionAttractor
 from .lorenz import LorenzAttractor
-from .physics import GravityAttractor
+from .physics import GravityAttractor, MagneticPendulumAttractor
 from .thomas import ThomasAttractor
 
-__all__ = ["GravityAttractor", "LorenzAttractor", "SuperpositionAttractor", "ThomasAttractor"]
+__all__ = [
+    "BasinAttractor",
+    "GravityAttractor",
+    "LorenzAttractor",
+    "MagneticPendulumAttractor",
+    "SuperpositionAttractor",
+    "ThomasAttractor",
+]
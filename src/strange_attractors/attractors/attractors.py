@@ -33,3 +33,37 @@ class SuperpositionAttractor(Attractor):
 
     def vector_field(self, vec: np.ndarray) -> np.ndarray:
         return np.sum(attractor.vector_field(vec) for attractor in self._attractors)  # type: ignore
+
+
+class BasinAttractor(Attractor):
+    """An attractor with a finite set of stable end states.
+
+    Subclasses map points of a 2D plane to initial states and decide which end
+    state a particle has settled at, which is all a basin map needs.
+    """
+
+    @property
+    @abstractmethod
+    def n_end_states(self) -> int:
+        """
+        Returns the number of stable end states.
+        """
+        ...
+
+    @abstractmethod
+    def initial_states(self, points: np.ndarray) -> np.ndarray:
+        """Initial states for points of the basin plane.
+
+        Input: np.ndarray shape (N, 2)
+        Output: np.ndarray shape (N, n_dim)
+        """
+        ...
+
+    @abstractmethod
+    def classify(self, vec: np.ndarray) -> np.ndarray:
+        """Index of the end state each particle has settled at, or -1 if it has not settled yet.
+
+        Input: np.ndarray shape (N, n_dim)
+        Output: np.ndarray shape (N,) of int
+        """
+        ...
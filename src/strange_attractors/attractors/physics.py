@@ -1,15 +1,15 @@
 """Physics attractors.
 
-I have ideas for adding more physics attractors to simulate a pendulum that is affected by magnets.
-These will however require the state space dimensionality to grow.
-Need to think about how to implement this nicely while keeping a clean 2/3d visualization state space.
+The magnetic pendulum lives in a 4d state space (position and velocity of the bob in the plane).
+Instead of visualizing its trajectories directly, its basins of attraction are rendered as a 2d
+label image, see `strange_attractors.analysis.basins`.
 """
 
 from dataclasses import dataclass
 
 import numpy as np
 
-from strange_attractors.attractors import Attractor
+from strange_attractors.attractors import Attractor, BasinAttractor
 
 
 @dataclass
@@ -31,3 +31,60 @@ class GravityAttractor(Attractor):
         force = np.zeros_like(vec)
         force[..., self.force_dim] = self.force
         return force
+
+
+@dataclass(frozen=True)
+class MagneticPendulumAttractor(BasinAttractor):
+    """Magnetic Pendulum
+
+    A damped pendulum bob swinging in the plane above a set of magnets. The state is
+    (x, y, vx, vy); the bob is pulled back to the origin with strength 'gravity', loses
+    energy through 'friction' and is attracted to each magnet with an inverse square law.
+    'height' is the distance between the plane of the bob and the plane of the magnets.
+    Every magnet is a stable end state, so the interesting output is the basin map.
+    """
+
+    magnets: tuple[tuple[float, float], ...] = (
+        (1.0, 0.0),
+        (-0.5, 0.8660254037844386),
+        (-0.5, -0.8660254037844386),
+    )
+    strength: float = 1.0
+    gravity: float = 0.5
+    friction: float = 0.2
+    height: float = 0.25
+    capture_radius: float = 0.1
+    capture_speed: float = 0.05
+
+    @property
+    def n_dim(self) -> int:
+        return 4
+
+    @property
+    def n_end_states(self) -> int:
+        return len(self.magnets)
+
+    def vector_field(self, vec: np.ndarray) -> np.ndarray:
+        """Vector Field of Magnetic Pendulum"""
+        pos, vel = vec[:, :2], vec[:, 2:]
+        acc = -self.gravity * pos - self.friction * vel
+        for magnet in self.magnets:
+            diff = np.asarray(magnet) - pos
+            dist_sq = np.sum(diff**2, axis=1, keepdims=True) + self.height**2
+            acc += self.strength * diff / dist_sq**1.5
+        return np.concatenate((vel, acc), axis=1)
+
+    def initial_states(self, points: np.ndarray) -> np.ndarray:
+        """Releases the bob at rest from each point."""
+        return np.concatenate((points, np.zeros_like(points)), axis=1)
+
+    def classify(self, vec: np.ndarray) -> np.ndarray:
+        """A particle has settled once it is slow and close to a magnet."""
+        pos, vel = vec[:, :2], vec[:, 2:]
+        magnets = np.asarray(self.magnets)
+        dist = np.linalg.norm(pos[:, None, :] - magnets[None, :, :], axis=-1)
+        nearest = np.argmin(dist, axis=1)
+        settled = (dist[np.arange(len(vec)), nearest] < self.capture_radius) & (
+            np.linalg.norm(vel, axis=1) < self.capture_speed
+        )
+        return np.where(settled, nearest, -1)
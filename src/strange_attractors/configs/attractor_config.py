@@ -2,10 +2,13 @@
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from strange_attractors.attractors import Attractor
 from strange_attractors.solvers.newton import NewtonSolver
 from strange_attractors.solvers.solver import RecurrentSolver, RingBufferedSolver, Solver
 from strange_attractors.utils.starting_states import recommended_starting_states
+from strange_attractors.utils.trajectory_cache import TrajectoryCache
 from strange_attractors.visu.visu import Visualizer
 
 
@@ -17,6 +20,8 @@ class SimSettings:
     n_steps: int = 10000
     ring_buffer_size: int = 10000
     n_flow: int = 10  # Number of frames in flow cycle for visualization
+    seed: int | None = None  # Seed for the starting states, makes them reproducible and cacheable
+    trajectory_cache: TrajectoryCache | None = None  # Cache for warm-up and ring buffer fill
 
 
 class AttractorConfig:
@@ -42,20 +47,50 @@ class AttractorConfig:
         self.visualizer_cls = visualizer
         self.solver: Solver = solver_cls(attractor)
         self.sim_settings = sim_settings
+        trajectory_cache = sim_settings.trajectory_cache
         if starting_state is None:
-            starting_state = recommended_starting_states[type(self.attractor)].generate(
-                self.sim_settings.num_particles
-            )
+            starting_states = recommended_starting_states[type(self.attractor)]
+            if sim_settings.seed is None:
+                starting_state = starting_states.generate(sim_settings.num_particles)
+            else:
+                # Starting states draw from the global RNG, which must not be reseeded for
+                # everyone else
+                rng_state = np.random.get_state()
+                np.random.seed(sim_settings.seed)
+                try:
+                    starting_state = starting_states.generate(sim_settings.num_particles)
+                finally:
+                    np.random.set_state(rng_state)
 
         # Run warm-up period to let transients settle before visualization
         if sim_settings.fast_start:
-            starting_state = self.solver.solve(starting_state, n_steps=10000, dt=sim_settings.dt)[
-                :, -1
-            ]
+            if trajectory_cache is not None:
+                starting_state = np.array(
+                    trajectory_cache.solve(
+                        self.solver, starting_state, 10000, sim_settings.dt, final_only=True
+                    )
+                )
+            else:
+                starting_state = self.solver.solve(
+                    starting_state, n_steps=10000, dt=sim_settings.dt
+                )[:, -1]
 
         self.starting_state = starting_state
-        recurrent_solver = RecurrentSolver(self.solver, starting_state, sim_settings.dt)
-        self.buffered_solver = RingBufferedSolver(recurrent_solver, size_rb=sim_settings.ring_buffer_size)
+        if trajectory_cache is None:
+            recurrent_solver = RecurrentSolver(self.solver, starting_state, sim_settings.dt)
+            self.buffered_solver = RingBufferedSolver(
+                recurrent_solver, size_rb=sim_settings.ring_buffer_size
+            )
+        else:
+            # solve() includes the starting state, which is not part of the fill
+            fill = trajectory_cache.solve(
+                self.solver, starting_state, sim_settings.ring_buffer_size + 1, sim_settings.dt
+            )
+            recurrent_solver = RecurrentSolver(self.solver, np.array(fill[:, -1]), sim_settings.dt)
+            self.buffered_solver = RingBufferedSolver(
+                recurrent_solver, size_rb=sim_settings.ring_buffer_size, fill=False
+            )
+            self.buffered_solver.prefill(fill[:, 1:])
 
     def run(self):
         # Pass n_flow to the visualizer if it's VispyVisualizer3D
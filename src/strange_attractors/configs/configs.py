@@ -2,9 +2,14 @@
 
 from strange_attractors.attractors import LorenzAttractor, ThomasAttractor
 from strange_attractors.configs.attractor_config import AttractorConfig, SimSettings
+from strange_attractors.utils.trajectory_cache import TrajectoryCache
 from strange_attractors.visu.matplotlib import MatplotlibVisualizer3D
 from strange_attractors.visu.vispy import VispyVisualizer3D
 
+# Shared by all configs, so warm-ups and ring buffer fills are only computed once per machine.
+# Sized for experiments.py, whose ten 1000-particle configs store 240 MB ring buffer fills each.
+trajectory_cache = TrajectoryCache(max_bytes=3 * 2**30)
+
 lorenz = AttractorConfig(
     attractor=LorenzAttractor(),
     visualizer=VispyVisualizer3D,
@@ -15,23 +20,41 @@ lorenz = AttractorConfig(
         n_steps=50000,
         ring_buffer_size=100000,
         n_flow=10,
+        seed=0,
+        trajectory_cache=trajectory_cache,
     ),
 )
 
 lorenz_single = AttractorConfig(
     attractor=LorenzAttractor(),
     visualizer=MatplotlibVisualizer3D,
-    sim_settings=SimSettings(num_particles=1, ring_buffer_size=10000),
+    sim_settings=SimSettings(
+        num_particles=1, ring_buffer_size=10000, seed=0, trajectory_cache=trajectory_cache
+    ),
 )
 
 thomas = AttractorConfig(
     attractor=ThomasAttractor(),
     visualizer=VispyVisualizer3D,
-    sim_settings=SimSettings(dt=0.03, num_particles=1, n_steps=50000, ring_buffer_size=100000),
+    sim_settings=SimSettings(
+        dt=0.03,
+        num_particles=1,
+        n_steps=50000,
+        ring_buffer_size=100000,
+        seed=0,
+        trajectory_cache=trajectory_cache,
+    ),
 )
 
 thomas09 = AttractorConfig(
     attractor=ThomasAttractor(a=0.19),
     visualizer=VispyVisualizer3D,
-    sim_settings=SimSettings(dt=0.03, num_particles=1, n_steps=50000, ring_buffer_size=10000),
+    sim_settings=SimSettings(
+        dt=0.03,
+        num_particles=1,
+        n_steps=50000,
+        ring_buffer_size=10000,
+        seed=0,
+        trajectory_cache=trajectory_cache,
+    ),
 )
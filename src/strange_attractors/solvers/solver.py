@@ -10,6 +10,10 @@ class Solver(ABC):
     def __init__(self, attractor: Attractor):
         self._attractor: Attractor = attractor
 
+    @property
+    def attractor(self) -> Attractor:
+        return self._attractor
+
     @abstractmethod
     def solve(self, state: np.ndarray, n_steps: int, dt: float) -> np.ndarray:
         """Takes states of shape (n_samples, n_dimensions) and returns an array
@@ -31,6 +35,10 @@ class RecurrentSolver:
     def state(self):
         return self._state
 
+    @property
+    def dt(self):
+        return self._dt
+
     def next(self, n_steps: int):
         # Request one extra step since solve() includes the starting state
         result = self._solver.solve(self._state, n_steps + 1, self._dt)
@@ -56,13 +64,33 @@ class RingBufferedSolver:
         n_particles, n_dim = rec_solver.state.shape
         self._rb = TrajectoryBuffer((n_particles, size_rb, n_dim))
         self.size_rb = size_rb
+        self._pending: list[np.ndarray] = []
         if fill:
             self.update(size_rb)
 
     def get(self):
         return self._rb.get()
 
+    def prefill(self, trajectories: np.ndarray):
+        """Fills the ring buffer with already solved trajectories.
+
+        They have to end in the current state of the recurrent solver.
+        """
+        self._rb.append(trajectories)
+
+    def prepare(self, n_steps: int):
+        """Solves steps ahead without adding them to the ring buffer yet.
+
+        Allows spreading the cost of an update over several frames while the
+        displayed buffer stays unchanged. The next update() appends them.
+        """
+        if n_steps > 0:
+            self._pending.append(self.rec_solver.next(n_steps))
+
     def update(self, n_steps: int) -> np.ndarray:
-        new_trajectories = self.rec_solver.next(n_steps)
-        self._rb.append(new_trajectories)
+        self.prepare(n_steps)
+        if self._pending:
+            new_trajectories = np.concatenate(self._pending, axis=1)[:, -self.size_rb :]
+            self._pending = []
+            self._rb.append(new_trajectories)
         return self._rb.get()
@@ -0,0 +1,14 @@
+"""Bifurcation diagram of the Thomas attractor, covering the range explored in experiments.py."""
+
+import numpy as np
+
+from strange_attractors.analysis import BifurcationEngine, BifurcationSettings
+from strange_attractors.attractors import ThomasAttractor
+
+if __name__ == "__main__":
+    engine = BifurcationEngine(
+        ThomasAttractor, "a", np.linspace(0.05, 0.25, 2000), BifurcationSettings()
+    )
+    result = engine.run()
+    print(result.report)
+    result.render("thomas_bifurcation.png")
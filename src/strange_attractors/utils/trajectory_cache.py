@@ -0,0 +1,201 @@
+"""Content-addressed on-disk cache for solved trajectories.
+
+Results are keyed by a hash of everything that determines them: the attractor class and its
+dataclass fields, the solver class, dt, n_steps, the bytes of the starting state and a cache
+version. They are stored as .npy files and loaded memory-mapped, so a cache hit costs little more
+than opening a file.
+
+Once the cache would grow beyond its size budget, the least recently used files are evicted.
+Files this cache instance has used are never evicted to make room for new ones; such new entries
+are not stored instead. Otherwise a program that cycles through more configs than fit, like
+experiments.py, would evict every entry right before it is needed again and never hit.
+"""
+
+import contextlib
+import dataclasses
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from strange_attractors.solvers.solver import Solver
+
+# Part of every key. Bump it whenever a solver or vector field changes its results, so that
+# trajectories cached by older code stop matching.
+CACHE_VERSION = "1"
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "strange_attractors" / "trajectories"
+
+
+class TrajectoryCache:
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = 2**30,
+        version: str = CACHE_VERSION,
+    ):
+        """
+        Args:
+            directory: Where to store cached arrays. Defaults to the user cache directory.
+            max_bytes: Size budget. Least recently used arrays are evicted beyond it.
+            version: Included in every key, entries stored under another version never match.
+        """
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.version = version
+        # Files this instance has stored or hit, protected from eviction
+        self._used: set[Path] = set()
+
+    def key(
+        self,
+        solver: Solver,
+        state: np.ndarray,
+        n_steps: int,
+        dt: float,
+        *,
+        final_only: bool = False,
+    ) -> str | None:
+        """Stable hash of a solve() call, or None if the attractor cannot be hashed.
+
+        Only dataclass attractors are cacheable, as their fields fully describe them.
+        Fields have to be JSON serializable, numpy scalars or numpy arrays.
+        """
+        attractor = solver.attractor
+        if not dataclasses.is_dataclass(attractor):
+            return None
+        description = {
+            "version": self.version,
+            "attractor": _qualified_name(type(attractor)),
+            "fields": dataclasses.asdict(attractor),
+            "solver": _qualified_name(type(solver)),
+            "dt": repr(float(dt)),
+            "n_steps": int(n_steps),
+            "final_only": final_only,
+            "state": _array_digest(state),
+        }
+        try:
+            encoded = json.dumps(description, sort_keys=True, default=_encode_field).encode()
+        except TypeError:
+            return None
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> np.ndarray | None:
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        # Mark as recently used. Another process may have evicted the file in the meantime, the
+        # mapping stays valid regardless.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        self._used.add(path)
+        return array
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        """Stores the array and returns it memory-mapped.
+
+        If there is no room for it, it is not stored and returned as is.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # Write to a temporary file first so readers never see a partial array
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        if not self._make_room(tmp_path.stat().st_size, replacing=path):
+            tmp_path.unlink()
+            return array
+        os.replace(tmp_path, path)
+        self._used.add(path)
+        try:
+            return np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            # Evicted by another process sharing the cache
+            return array
+
+    def solve(
+        self,
+        solver: Solver,
+        state: np.ndarray,
+        n_steps: int,
+        dt: float,
+        *,
+        final_only: bool = False,
+    ) -> np.ndarray:
+        """Cached version of solver.solve(state, n_steps, dt).
+
+        With final_only, only the last state of shape (n_samples, n_dimensions) is
+        returned and stored, which is all a warm-up needs.
+        """
+        key = self.key(solver, state, n_steps, dt, final_only=final_only)
+        if key is not None:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+        result = solver.solve(state, n_steps, dt)
+        if final_only:
+            result = result[:, -1]
+        if key is None:
+            return result
+        return self.put(key, result)
+
+    def clear(self):
+        for path in self.directory.glob("*.npy"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def _make_room(self, size: int, replacing: Path) -> bool:
+        """Evicts least recently used files so that `size` more bytes fit into the budget.
+
+        Returns False without evicting anything if that is impossible without evicting files
+        this instance has used.
+        """
+        entries = []
+        for path in self.directory.glob("*.npy"):
+            if path == replacing:
+                continue
+            # Other processes sharing the cache may evict files at any time
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((path, path.stat()))
+        total = sum(stat.st_size for _, stat in entries)
+        evictable = sorted(
+            ((path, stat) for path, stat in entries if path not in self._used),
+            key=lambda entry: entry[1].st_mtime_ns,
+        )
+        if total - sum(stat.st_size for _, stat in evictable) + size > self.max_bytes:
+            return False
+
+        for path, stat in evictable:
+            if total + size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+        return True
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _array_digest(array: np.ndarray) -> list:
+    array = np.ascontiguousarray(array)
+    return [array.dtype.str, array.shape, hashlib.sha256(array.tobytes()).hexdigest()]
+
+
+def _encode_field(value):
+    """JSON encoding of dataclass field values the json module does not handle itself."""
+    if isinstance(value, np.ndarray):
+        # Hash the bytes, as the repr of large arrays is truncated
+        return {"ndarray": _array_digest(value)}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot hash field value of type {type(value).__name__}")
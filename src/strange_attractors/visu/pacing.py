@@ -0,0 +1,218 @@
+"""Closed-loop frame pacing for the live visualizers.
+
+A fixed timer interval and a hand-tuned number of steps per frame only work on the machine they
+were tuned on: once a frame takes longer than the interval, frames are dropped and the animation
+slows down. The FramePacer instead measures what each frame actually costs and adapts
+
+    - the number of solver steps per frame, so simulated time advances at `sim_rate`
+      simulated time units per wall-clock second, independent of the achieved frame rate,
+    - the point budget, i.e. how many points can be coloured, uploaded and drawn per frame at
+      the target frame rate,
+    - the flow cadence n_flow, the subsampling factor that keeps the drawn points within budget.
+
+The steps of a flow cycle are solved spread over its frames and only shown once the next cycle
+starts, so the solver cost per frame does not grow with n_flow. When the solver alone would exceed
+its share of the frame budget, the steps per frame are capped and the simulation runs slower.
+
+Not all of a frame's cost is visible to CPU timers, as the GPU works asynchronously. Whenever the
+achieved frame rate falls short of the target, the achieved frame interval per point is taken as
+a lower bound for the point cost. That bound decays slowly once the target is met again.
+"""
+
+import contextlib
+import math
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+# Timed phases of a frame. The draw happens after the timer callback, when the canvas redraws.
+PHASES = ("solve", "color", "upload", "draw")
+
+
+@dataclass
+class PacingSettings:
+    target_fps: float = 60.0
+    sim_rate: float = 1.0  # Simulated time units per wall-clock second
+    max_n_flow: int = 100  # Upper bound for the flow cadence
+    headroom: float = 0.8  # Fraction of the frame interval the measured work may use
+    smoothing: float = 0.1  # Weight of a new measurement in the moving averages
+    max_frame_gap: float = 0.25  # Longer pauses (window setup, dragging) are not caught up
+    slow_fraction: float = 0.95  # Frame rates below this fraction of the target count as slow
+    solve_fraction: float = 0.5  # Fraction of the frame budget the solver may use
+
+
+@dataclass
+class PacingState:
+    """Snapshot of the controller, for logging."""
+
+    target_fps: float
+    fps: float  # Smoothed achieved frame rate
+    sim_rate: float  # Simulated time units per wall-clock second
+    steps_per_frame: int  # Solver steps of the last flow cycle, spread over its frames
+    n_flow: int
+    point_budget: int
+    solve_cost: float  # Smoothed seconds per solver step
+    color_cost: float  # Smoothed seconds per coloured point
+    upload_cost: float  # Smoothed seconds per uploaded point
+    draw_cost: float  # Smoothed seconds per drawn point
+    hidden_cost: float  # Seconds per point not covered by the timed phases
+
+    def __str__(self) -> str:
+        return (
+            f"[pacing] fps={self.fps:.1f}/{self.target_fps:.0f}, sim_rate={self.sim_rate:.3g}, "
+            f"steps={self.steps_per_frame}, n_flow={self.n_flow}, budget={self.point_budget}, "
+            f"solve={self.solve_cost * 1e6:.2f}us/step, "
+            f"color={self.color_cost * 1e9:.1f}ns/pt, upload={self.upload_cost * 1e9:.1f}ns/pt, "
+            f"draw={self.draw_cost * 1e9:.1f}ns/pt, hidden={self.hidden_cost * 1e9:.1f}ns/pt"
+        )
+
+
+class FramePacer:
+    """Adapts steps per frame, n_flow and the point budget to hold the target frame rate."""
+
+    def __init__(
+        self,
+        settings: PacingSettings,
+        *,
+        dt: float,
+        total_points: int,
+        max_steps: int,
+        n_flow: int = 10,
+    ):
+        """
+        Args:
+            settings: Target frame rate, simulation rate and controller tuning.
+            dt: Time step of the solver.
+            total_points: Number of points in the ring buffer (n_particles * ring buffer size).
+            max_steps: Upper bound for steps per flow cycle, usually the ring buffer size.
+            n_flow: Initial flow cadence.
+        """
+        self.settings = settings
+        self.target_fps = settings.target_fps
+        self.sim_rate = settings.sim_rate
+        self.dt = dt
+        self.total_points = total_points
+        self.max_steps = max_steps
+        self.n_flow = n_flow
+
+        self.steps_per_frame = 0
+        self.point_budget = math.ceil(total_points / n_flow)
+        self.fps = float(self.target_fps)
+        self._costs = dict.fromkeys((*PHASES, "frame"), 0.0)
+        self._timings = dict.fromkeys(PHASES, 0.0)
+        self._hidden_cost = 0.0
+        self._sim_time_debt = 0.0
+        self._cycle_steps = 0
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Times one phase of the current frame, see PHASES."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(phase, time.perf_counter() - start)
+
+    def add_timing(self, phase: str, seconds: float):
+        """Adds time spent in a phase that is timed by events, such as the canvas draw."""
+        self._timings[phase] += seconds
+
+    def steps_for_frame(self) -> int:
+        """Solver steps to compute in this frame to catch up with wall-clock time.
+
+        Steps are limited to the solver's share of the frame budget, and to max_steps per flow
+        cycle. Time that cannot be caught up within these limits is dropped instead of carried
+        over, so a slow machine runs slower rather than stalling on ever larger updates.
+        """
+        limit = min(self._max_frame_steps(), self.max_steps - self._cycle_steps)
+        steps = round(self._sim_time_debt / self.dt)
+        if steps >= limit:
+            steps = max(limit, 0)
+            self._sim_time_debt = 0.0
+        else:
+            self._sim_time_debt -= steps * self.dt
+        self._cycle_steps += steps
+        return steps
+
+    def frame_done(self, wall_dt: float, n_points: int, n_steps: int):
+        """Feeds back the measurements of a finished frame.
+
+        Args:
+            wall_dt: Wall-clock seconds since the previous frame.
+            n_points: Number of points coloured, uploaded and drawn in this frame.
+            n_steps: Number of solver steps computed in this frame.
+        """
+        self._sim_time_debt += min(wall_dt, self.settings.max_frame_gap) * self.sim_rate
+        if wall_dt > 0:
+            self.fps = self._smooth(self.fps, 1.0 / wall_dt)
+        if n_steps > 0:
+            self._update_cost("solve", self._timings["solve"] / n_steps)
+        if n_points > 0:
+            for phase in ("color", "upload", "draw"):
+                self._update_cost(phase, self._timings[phase] / n_points)
+            if 0 < wall_dt <= self.settings.max_frame_gap:
+                # Everything in the frame interval except the solver is attributed to the points
+                render_time = max(wall_dt - self._timings["solve"], 0.0)
+                self._update_cost("frame", render_time / n_points)
+        self._timings = dict.fromkeys(self._timings, 0.0)
+
+    def next_n_flow(self) -> int:
+        """Flow cadence for the next cycle, derived from the point budget.
+
+        Only call at the start of a flow cycle, so the subsampling offsets stay consistent.
+        """
+        self.steps_per_frame = self._cycle_steps
+        self._cycle_steps = 0
+        settings = self.settings
+        measured_cost = self._costs["color"] + self._costs["upload"] + self._costs["draw"]
+        if self.fps < settings.slow_fraction * self.target_fps:
+            # Frames come slower than the timer fires, so the frame interval is the real cost
+            self._hidden_cost = max(self._hidden_cost, self._costs["frame"] - measured_cost)
+        else:
+            self._hidden_cost *= 1 - settings.smoothing
+        point_cost = measured_cost + self._hidden_cost
+        if point_cost == 0.0:
+            return self.n_flow
+
+        frame_budget = settings.headroom / self.target_fps
+        # Every frame solves its share of the cycle, which does not depend on n_flow
+        steps = min(self.sim_rate / (self.target_fps * self.dt), self._max_frame_steps())
+        solve_time = min(self._costs["solve"] * steps, settings.solve_fraction * frame_budget)
+        render_budget = frame_budget - solve_time
+        self.point_budget = max(int(render_budget / point_cost), 1)
+
+        needed = min(max(math.ceil(self.total_points / self.point_budget), 1), settings.max_n_flow)
+        # Coarsen immediately, but refine only with some margin to avoid flickering
+        if needed > self.n_flow or needed < 0.8 * self.n_flow:
+            self.n_flow = needed
+        return self.n_flow
+
+    @property
+    def state(self) -> PacingState:
+        return PacingState(
+            target_fps=self.target_fps,
+            fps=self.fps,
+            sim_rate=self.sim_rate,
+            steps_per_frame=self.steps_per_frame,
+            n_flow=self.n_flow,
+            point_budget=self.point_budget,
+            solve_cost=self._costs["solve"],
+            color_cost=self._costs["color"],
+            upload_cost=self._costs["upload"],
+            draw_cost=self._costs["draw"],
+            hidden_cost=self._hidden_cost,
+        )
+
+    def _max_frame_steps(self) -> int:
+        """Solver steps that fit into the solver's share of the frame budget."""
+        if self._costs["solve"] == 0.0:
+            return self.max_steps
+        solve_budget = self.settings.solve_fraction * self.settings.headroom / self.target_fps
+        return max(int(solve_budget / self._costs["solve"]), 1)
+
+    def _update_cost(self, phase: str, cost: float):
+        previous = self._costs[phase]
+        self._costs[phase] = cost if previous == 0.0 else self._smooth(previous, cost)
+
+    def _smooth(self, previous: float, new: float) -> float:
+        return (1 - self.settings.smoothing) * previous + self.settings.smoothing * new
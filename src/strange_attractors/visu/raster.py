@@ -0,0 +1,47 @@
+"""Headless rasterization of 2D point clouds into images.
+
+Used for plots with far more points than an interactive window can handle, such as
+bifurcation diagrams. Needs neither a display nor an OpenGL context.
+"""
+
+from pathlib import Path
+
+import imageio as iio
+import matplotlib
+import numpy as np
+
+
+def rasterize(
+    x: np.ndarray,
+    y: np.ndarray,
+    resolution: tuple[int, int],
+    extent: tuple[float, float, float, float],
+) -> np.ndarray:
+    """Counts the points falling into each pixel.
+
+    Args:
+        x, y: Point coordinates of shape (N,).
+        resolution: Image (width, height) in pixels.
+        extent: (x_min, x_max, y_min, y_max) covered by the image.
+
+    Returns:
+        Counts of shape (height, width); row 0 is the top of the image, i.e. y_max.
+    """
+    width, height = resolution
+    x_min, x_max, y_min, y_max = extent
+    counts, _, _ = np.histogram2d(
+        y, x, bins=(height, width), range=((y_min, y_max), (x_min, x_max))
+    )
+    return counts[::-1]
+
+
+def density_image(counts: np.ndarray, cmap: str = "inferno") -> np.ndarray:
+    """Maps log-scaled counts to an RGB image of dtype uint8."""
+    density = np.log1p(counts)
+    density /= max(density.max(), 1e-12)
+    rgba = matplotlib.colormaps[cmap](density)
+    return (rgba[..., :3] * 255).astype(np.uint8)
+
+
+def save_image(path: str | Path, image: np.ndarray):
+    iio.imwrite(path, image)
@@ -1,13 +1,15 @@
 """Real-time 3D visualization using VisPy."""
 
 import contextlib
+import time
 
 import imageio as iio
+import matplotlib
 import numpy as np
-from matplotlib.cm import get_cmap
 from vispy import app, scene
 
 from strange_attractors.solvers.solver import RingBufferedSolver
+from strange_attractors.visu.pacing import FramePacer, PacingSettings, PacingState
 from strange_attractors.visu.visu import Visualizer
 
 
@@ -25,6 +27,8 @@ class VispyVisualizer3D(Visualizer):
         cmap: str = "inferno",
         output: str | None = None,
         n_flow: int = 10,
+        adaptive: bool = True,
+        sim_rate: float | None = None,
     ):
         """
         Args:
@@ -36,13 +40,16 @@ class VispyVisualizer3D(Visualizer):
             cmap: Matplotlib colormap name for velocity coloring.
             output: Path to output video file (e.g., "output.mp4"), or None for no recording.
             n_flow: Number of frames in the flow cycle. Trajectory is subsampled as [offset::n_flow] where offset cycles 0 to n_flow-1.
+            adaptive: Whether a FramePacer adapts steps_per_frame and n_flow to hold the target fps.
+            sim_rate: Simulated time units per second for adaptive pacing. Defaults to the rate
+                steps_per_frame, n_flow and fps would nominally give.
         """
         self.solver = solver
         self.fps = fps
         self.steps_per_frame = steps_per_frame
         self.point_size = point_size
         self.background = background
-        self.cmap = get_cmap(cmap)
+        self.cmap = matplotlib.colormaps[cmap]
         self.output = output
         self.n_flow = n_flow
 
@@ -53,6 +60,30 @@ class VispyVisualizer3D(Visualizer):
         # Track current offset in the flow cycle
         self.flow_offset = 0
 
+        self.pacer: FramePacer | None = None
+        if adaptive:
+            dt = solver.rec_solver.dt
+            n_particles, size_rb, _ = solver.get().shape
+            if sim_rate is None:
+                sim_rate = steps_per_frame * dt * fps / n_flow
+            self.pacer = FramePacer(
+                PacingSettings(target_fps=fps, sim_rate=sim_rate),
+                dt=dt,
+                total_points=n_particles * size_rb,
+                max_steps=size_rb,
+                n_flow=n_flow,
+            )
+
+    @property
+    def pacing_state(self) -> PacingState | None:
+        """Current state of the frame pacer, or None if pacing is not adaptive."""
+        return self.pacer.state if self.pacer is not None else None
+
+    def _measure(self, phase: str):
+        if self.pacer is None:
+            return contextlib.nullcontext()
+        return self.pacer.measure(phase)
+
     def _compute_colors(self, trajectory: np.ndarray, offset: int) -> np.ndarray:
         """Compute colors based on velocity magnitude with fading trail effect.
 
@@ -63,26 +94,24 @@ class VispyVisualizer3D(Visualizer):
         Returns:
             RGBA colors of shape (n_particles * subsampled_steps, 4) for trajectory[offset::n_flow]
         """
-        n_particles, n_steps, _ = trajectory.shape
+        _, n_steps, _ = trajectory.shape
 
-        # Subsample the trajectory
-        subsampled = trajectory[:, offset::self.n_flow, :]
-        n_sub_steps = subsampled.shape[1]
+        # Indices of the subsampled trajectory
+        steps = np.arange(offset, n_steps, self.n_flow)
+        n_sub_steps = len(steps)
 
         # Compute velocity (difference between consecutive steps in the ORIGINAL trajectory)
-        # We want colors based on actual velocity, not subsampled velocity
-        velocity = np.diff(trajectory, axis=1)
-        speed = np.linalg.norm(velocity, axis=-1)  # (n_particles, n_steps-1)
-
-        # Pad to match trajectory length (repeat first speed)
-        speed = np.concatenate([speed[:, :1], speed], axis=1)  # (n_particles, n_steps)
-
-        # Subsample the speed to match the subsampled trajectory
-        speed_sub = speed[:, offset::self.n_flow]
+        # We want colors based on actual velocity, not subsampled velocity.
+        # Only evaluated at the subsampled steps, so the cost scales with the drawn points.
+        # Step 0 has no predecessor and repeats the first speed.
+        prev_steps = np.maximum(steps - 1, 0)
+        next_steps = np.maximum(steps, 1)
+        velocity = trajectory[:, next_steps] - trajectory[:, prev_steps]
+        speed_sub = np.linalg.norm(velocity, axis=-1)  # (n_particles, n_sub_steps)
 
         # Update all-time speed range (only expands)
-        self.speed_min = min(self.speed_min, speed.min())
-        self.speed_max = max(self.speed_max, speed.max())
+        self.speed_min = min(self.speed_min, speed_sub.min())
+        self.speed_max = max(self.speed_max, speed_sub.max())
 
         # Normalize speed for colormap using stable all-time range
         speed_norm = (speed_sub - self.speed_min) / (self.speed_max - self.speed_min + 1e-12)
@@ -135,7 +164,12 @@ class VispyVisualizer3D(Visualizer):
         view.camera.set_range(x=(mins[0], maxs[0]), y=(mins[1], maxs[1]), z=(mins[2], maxs[2]))
 
         # Animation state
-        state = {"paused": False, "rotate": False, "frame_count": 0}
+        state = {
+            "paused": False,
+            "rotate": False,
+            "frame_count": 0,
+            "last_tick": time.perf_counter(),
+        }
 
         # Video writer
         writer = None
@@ -148,31 +182,56 @@ class VispyVisualizer3D(Visualizer):
                 pixelformat="yuv420p",
             )
 
-        def render():
-            """Render the current trajectory state with subsampling based on flow offset."""
+        def render() -> int:
+            """Render the current trajectory state with subsampling based on flow offset.
+
+            Returns the number of rendered points.
+            """
             traj = self.solver.get()
 
             # Subsample trajectory based on current flow offset
-            subsampled_traj = traj[:, self.flow_offset::self.n_flow, :]
-            colors = self._compute_colors(traj, self.flow_offset)
-            points = subsampled_traj.reshape(-1, 3)
+            with self._measure("color"):
+                subsampled_traj = traj[:, self.flow_offset :: self.n_flow, :]
+                colors = self._compute_colors(traj, self.flow_offset)
+                points = subsampled_traj.reshape(-1, 3)
 
-            scatter.set_data(points, face_color=colors, size=self.point_size, edge_width=0)
-            scatter.set_gl_state(blend=True, depth_test=False, depth_mask=False)
+            with self._measure("upload"):
+                scatter.set_data(points, face_color=colors, size=self.point_size, edge_width=0)
+                scatter.set_gl_state(blend=True, depth_test=False, depth_mask=False)
+            return len(points)
 
         def on_timer(_):
+            now = time.perf_counter()
+            # Recorded videos play at a fixed fps, so their simulated time follows the frame count
+            wall_dt = 1.0 / self.fps if writer is not None else now - state["last_tick"]
+            state["last_tick"] = now
             if state["paused"]:
                 return
 
             # Advance flow offset
             self.flow_offset = (self.flow_offset + 1) % self.n_flow
 
-            # Only compute new trajectory points after completing a full flow cycle
-            if self.flow_offset == 0:
-                self.solver.update(self.steps_per_frame)
+            n_steps = 0
+            if self.pacer is not None:
+                # Solve the steps of the cycle spread over its frames, they are shown once the
+                # next cycle starts
+                n_steps = self.pacer.steps_for_frame()
+                with self._measure("solve"):
+                    self.solver.prepare(n_steps)
+                    if self.flow_offset == 0:
+                        self.solver.update(0)
+                if self.flow_offset == 0:
+                    self.n_flow = self.pacer.next_n_flow()
+                    self.steps_per_frame = self.pacer.steps_per_frame
+            elif self.flow_offset == 0:
+                # Only compute new trajectory points after completing a full flow cycle
+                n_steps = self.steps_per_frame
+                self.solver.update(n_steps)
 
             # Render
-            render()
+            n_points = render()
+            if self.pacer is not None:
+                self.pacer.frame_done(wall_dt, n_points=n_points, n_steps=n_steps)
 
             # Rotate camera if enabled
             if state["rotate"]:
@@ -193,6 +252,18 @@ class VispyVisualizer3D(Visualizer):
         # Start timer (must keep reference to prevent garbage collection)
         _timer = app.Timer(interval=1.0 / self.fps, connect=on_timer, start=True)
 
+        if self.pacer is not None:
+            # The GPU upload and draw happen when the canvas redraws, after on_timer returned
+            def on_draw_start(_):
+                state["draw_start"] = time.perf_counter()
+
+            def on_draw_end(_):
+                if "draw_start" in state:
+                    self.pacer.add_timing("draw", time.perf_counter() - state.pop("draw_start"))
+
+            canvas.events.draw.connect(on_draw_start, position="first")
+            canvas.events.draw.connect(on_draw_end, position="last")
+
         @canvas.events.key_press.connect
         def on_key(event):
             if event.key == "Space":
@@ -200,9 +271,17 @@ class VispyVisualizer3D(Visualizer):
             elif event.key == "R":
                 state["rotate"] = not state["rotate"]
             elif event.key == "Up":
-                self.steps_per_frame = min(self.steps_per_frame + 5, 100)
+                if self.pacer is not None:
+                    self.pacer.sim_rate *= 1.25
+                else:
+                    self.steps_per_frame = min(self.steps_per_frame + 5, 100)
             elif event.key == "Down":
-                self.steps_per_frame = max(self.steps_per_frame - 5, 1)
+                if self.pacer is not None:
+                    self.pacer.sim_rate /= 1.25
+                else:
+                    self.steps_per_frame = max(self.steps_per_frame - 5, 1)
+            elif event.key == "P" and self.pacer is not None:
+                print(self.pacing_state)
             elif event.key == "C":
                 cam = view.camera
                 print(f"[cam] az={cam.azimuth:.2f}°, el={cam.elevation:.2f}°, fov={cam.fov:.1f}")
@@ -0,0 +1,53 @@
+from dataclasses import replace
+
+import numpy as np
+
+from strange_attractors.analysis import BasinEngine, BasinSettings
+from strange_attractors.analysis.basins import label_dtype
+from strange_attractors.attractors import MagneticPendulumAttractor
+
+
+def test_basin_engine(tmp_path):
+    attractor = MagneticPendulumAttractor()
+    settings = BasinSettings(
+        extent=(-1.0, 1.0, -1.0, 1.0),
+        resolution=(9, 7),
+        dt=0.02,
+        max_steps=5000,
+        tile_size=4,
+        n_workers=1,
+    )
+    output = tmp_path / "basins.npy"
+    labels = BasinEngine(attractor, settings).run(output)
+
+    assert labels.shape == (7, 9)
+    # The bob released right next to magnet 0 (x=1, y=0) stays there
+    assert labels[3, 8] == 0
+    np.testing.assert_array_equal(np.load(output), labels)
+
+
+def test_basin_engine_process_pool(tmp_path):
+    attractor = MagneticPendulumAttractor()
+    # More tiles than are kept in flight at once
+    settings = BasinSettings(resolution=(6, 6), dt=0.02, max_steps=2000, tile_size=2)
+    serial = BasinEngine(attractor, replace(settings, n_workers=1))
+    pooled = BasinEngine(attractor, replace(settings, n_workers=2))
+    np.testing.assert_array_equal(
+        serial.run(tmp_path / "serial.npy"), pooled.run(tmp_path / "pooled.npy")
+    )
+
+
+def test_label_dtype():
+    assert label_dtype(3) == np.int8
+    assert label_dtype(128) == np.int8
+    assert label_dtype(129) == np.int16
+    assert label_dtype(40000) == np.int32
+
+
+def test_basin_engine_many_magnets(tmp_path):
+    angles = np.linspace(0, 2 * np.pi, 200, endpoint=False)
+    magnets = tuple((float(np.cos(a)), float(np.sin(a))) for a in angles)
+    attractor = MagneticPendulumAttractor(magnets=magnets)
+    settings = BasinSettings(resolution=(2, 2), max_steps=10, n_workers=1)
+    labels = BasinEngine(attractor, settings).run(tmp_path / "basins.npy")
+    assert labels.dtype == np.int16
@@ -0,0 +1,84 @@
+import math
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from strange_attractors.analysis import BifurcationEngine, BifurcationSettings
+from strange_attractors.attractors import MagneticPendulumAttractor, ThomasAttractor
+
+settings = BifurcationSettings(
+    n_warmup=1000, n_steps=3000, chunk_steps=700, values_per_batch=3, n_particles=2, n_workers=1
+)
+values = np.linspace(0.1, 0.2, 7)
+
+
+def test_bifurcation_maxima():
+    result = BifurcationEngine(ThomasAttractor, "a", values, settings).run()
+
+    assert len(result.parameters) == len(result.values) == result.report.n_points > 0
+    assert set(np.unique(result.parameters)) <= set(values)
+    assert result.report.integration_steps == 7 * 2 * 4000
+    # Peak memory cannot be measured where the resource module is missing (Windows)
+    if result.report.peak_rss is not None:
+        assert result.report.peak_rss > 0
+
+
+def test_bifurcation_chunking():
+    # Maxima at chunk borders are found exactly once
+    chunked = BifurcationEngine(ThomasAttractor, "a", values, settings).run()
+    whole = BifurcationEngine(
+        ThomasAttractor, "a", values, replace(settings, chunk_steps=3000)
+    ).run()
+    np.testing.assert_allclose(np.sort(chunked.values), np.sort(whole.values))
+
+
+def test_bifurcation_section():
+    section = replace(settings, mode="section", section_coordinate=2, section_value=0.0)
+    result = BifurcationEngine(ThomasAttractor, "a", values, section).run()
+    assert result.report.n_points > 0
+
+
+def test_bifurcation_process_pool(tmp_path):
+    serial = BifurcationEngine(ThomasAttractor, "a", values, settings).run()
+    pooled = BifurcationEngine(ThomasAttractor, "a", values, replace(settings, n_workers=2)).run()
+    np.testing.assert_array_equal(serial.parameters, pooled.parameters)
+    np.testing.assert_array_equal(serial.values, pooled.values)
+
+    image = pooled.render(tmp_path / "bifurcation.png", resolution=(40, 20))
+    assert image.shape == (20, 40, 3)
+    assert (tmp_path / "bifurcation.png").exists()
+
+
+def test_bifurcation_rejects_unbatched_parameter():
+    # The friction multiplies (N, 2) velocities, so one value per particle does not broadcast
+    for values_per_batch in (2, 3):
+        with pytest.raises(ValueError, match="friction"):
+            BifurcationEngine(
+                MagneticPendulumAttractor,
+                "friction",
+                values,
+                replace(settings, values_per_batch=values_per_batch),
+            )
+
+
+def test_bifurcation_render_empty(tmp_path):
+    # The section plane lies far outside the attractor
+    section = replace(settings, mode="section", section_value=100.0)
+    result = BifurcationEngine(ThomasAttractor, "a", values, section).run()
+    assert result.report.n_points == 0
+
+    with pytest.raises(ValueError, match="No points"):
+        result.render(tmp_path / "bifurcation.png")
+    image = result.render(tmp_path / "bifurcation.png", resolution=(4, 2), extent=(0, 1, 0, 1))
+    assert image.shape == (2, 4, 3)
+
+
+def test_bifurcation_rejects_scalar_only_parameter():
+    # Scalar-only math raises TypeError on an array parameter rather than ValueError
+    class ScalarThomas(ThomasAttractor):
+        def vector_field(self, vec):
+            return super().vector_field(vec) * math.exp(self.a)
+
+    with pytest.raises(ValueError, match="cannot be swept"):
+        BifurcationEngine(ScalarThomas, "a", values, settings)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from strange_attractors.attractors import MagneticPendulumAttractor
+
+
+def test_magnetic_pendulum_symmetric_rest():
+    attractor = MagneticPendulumAttractor()
+    positions = np.array([[0.0, 0.0, 0.0, 0.0]])
+    expected_vf = np.array([[0.0, 0.0, 0.0, 0.0]])
+    vf = attractor.vector_field(positions)
+    np.testing.assert_allclose(vf, expected_vf, atol=1e-12)
+
+
+def test_magnetic_pendulum_dim():
+    attractor = MagneticPendulumAttractor()
+    expected_dim = 4
+    assert attractor.n_dim == expected_dim
+
+
+def test_magnetic_pendulum_classify():
+    attractor = MagneticPendulumAttractor()
+    states = np.array(
+        [
+            [1.0, 0.0, 0.0, 0.0],  # at rest on magnet 0
+            [-0.5, -0.85, 0.0, 0.0],  # at rest close to magnet 2
+            [-0.5, -0.85, 1.0, 0.0],  # close to magnet 2 but too fast
+            [0.0, 0.0, 0.0, 0.0],  # far from all magnets
+        ]
+    )
+    np.testing.assert_array_equal(attractor.classify(states), [0, 2, -1, -1])
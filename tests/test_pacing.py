@@ -0,0 +1,95 @@
+import time
+
+from strange_attractors.visu.pacing import FramePacer, PacingSettings
+
+TOTAL_POINTS = 100000
+N_FLOW = 10
+
+
+def make_pacer():
+    settings = PacingSettings(target_fps=50, sim_rate=1.0)
+    return FramePacer(settings, dt=0.01, total_points=TOTAL_POINTS, max_steps=1000, n_flow=N_FLOW)
+
+
+def test_pacer_sim_rate_independent_of_fps():
+    # 2 seconds at 1 simulated time unit per second and dt=0.01
+    expected_steps = 200
+    for wall_dt in (1 / 60, 1 / 20):
+        pacer = make_pacer()
+        total_steps = 0
+        for _ in range(round(2.0 / wall_dt)):
+            pacer.frame_done(wall_dt, n_points=0, n_steps=0)
+            total_steps += pacer.steps_for_frame()
+        assert abs(total_steps - expected_steps) <= 1
+
+
+def test_pacer_drops_long_gaps():
+    # Only max_frame_gap=0.25s of the 10s pause is caught up
+    expected_steps = 25
+    pacer = make_pacer()
+    pacer.frame_done(10.0, n_points=0, n_steps=0)
+    assert pacer.steps_for_frame() == expected_steps
+    assert pacer.steps_for_frame() == 0
+
+
+def test_pacer_coarsens_when_rendering_is_slow():
+    pacer = make_pacer()
+    # Colouring 10000 points takes longer than the 20ms frame interval
+    with pacer.measure("color"):
+        time.sleep(0.03)
+    pacer.frame_done(1 / 50, n_points=10000, n_steps=0)
+
+    n_flow = pacer.next_n_flow()
+    assert n_flow > N_FLOW
+    assert pacer.state.point_budget * n_flow >= TOTAL_POINTS
+    assert pacer.state.n_flow == n_flow
+
+
+def test_pacer_refines_when_rendering_is_fast():
+    pacer = make_pacer()
+    with pacer.measure("upload"):
+        pass
+    pacer.frame_done(1 / 50, n_points=10000, n_steps=0)
+    assert pacer.next_n_flow() < N_FLOW
+
+
+def test_pacer_coarsens_when_frames_are_slow():
+    pacer = make_pacer()
+    # Colour and upload look cheap, but frames arrive at 20 instead of 50 fps, e.g. because the
+    # GPU draw is the bottleneck
+    for _ in range(5):
+        with pacer.measure("color"):
+            pass
+        pacer.frame_done(1 / 20, n_points=10000, n_steps=0)
+
+    n_flow = pacer.next_n_flow()
+    assert n_flow > N_FLOW
+    assert pacer.state.hidden_cost > 0
+
+
+def test_pacer_draw_timing():
+    pacer = make_pacer()
+    pacer.add_timing("draw", 0.03)
+    pacer.frame_done(1 / 50, n_points=10000, n_steps=0)
+    assert pacer.state.draw_cost > 0
+    assert pacer.next_n_flow() > N_FLOW
+
+
+def test_pacer_n_flow_does_not_grow_when_solving_dominates():
+    # One solver step takes 10ms, so the 2 steps per frame nominally needed exceed the 16ms
+    # frame budget, while colouring the points is cheap
+    step_cost = 0.01
+    pacer = make_pacer()
+    offset = 0
+    for _ in range(20 * N_FLOW):
+        n_steps = pacer.steps_for_frame()
+        pacer.add_timing("solve", n_steps * step_cost)
+        pacer.add_timing("color", 0.001)
+        pacer.frame_done(max(1 / 50, n_steps * step_cost + 0.001), n_points=10000, n_steps=n_steps)
+        offset = (offset + 1) % pacer.n_flow
+        if offset == 0:
+            assert pacer.next_n_flow() <= N_FLOW
+
+    # The solver is held within its share of the frame budget and the simulation runs slower
+    assert pacer.steps_for_frame() <= 1
+    assert pacer.state.steps_per_frame < pacer.n_flow * 2
@@ -0,0 +1,18 @@
+import numpy as np
+
+from strange_attractors.visu.raster import density_image, rasterize
+
+
+def test_rasterize():
+    x = np.array([0.1, 0.1, 0.9])
+    y = np.array([0.1, 0.1, 0.9])
+    counts = rasterize(x, y, resolution=(4, 2), extent=(0.0, 1.0, 0.0, 1.0))
+
+    expected = np.zeros((2, 4))
+    expected[1, 0] = 2  # bottom left
+    expected[0, 3] = 1  # top right
+    np.testing.assert_allclose(counts, expected)
+
+    image = density_image(counts)
+    assert image.shape == (2, 4, 3)
+    assert image.dtype == np.uint8
@@ -1,5 +1,8 @@
 import numpy as np
 
+from strange_attractors.attractors import LorenzAttractor
+from strange_attractors.solvers.newton import NewtonSolver
+from strange_attractors.solvers.solver import RecurrentSolver, RingBufferedSolver
 from strange_attractors.utils.ringbuffer import TrajectoryBuffer
 
 
@@ -16,3 +19,21 @@ def test_ringbuffer():
     expected[:, -2:] = 2
 
     np.testing.assert_allclose(buffer.get(), expected)
+
+
+def test_ring_buffered_solver_prepare():
+    attractor = LorenzAttractor()
+    state = np.array([[1.0, 1.0, 1.0], [-1.0, 2.0, 3.0]])
+
+    direct = RingBufferedSolver(RecurrentSolver(NewtonSolver(attractor), state, 0.01), 20)
+    direct.update(7)
+
+    spread = RingBufferedSolver(RecurrentSolver(NewtonSolver(attractor), state, 0.01), 20)
+    before = spread.get().copy()
+    spread.prepare(3)
+    spread.prepare(4)
+    # Prepared steps are only shown after the next update
+    np.testing.assert_array_equal(spread.get(), before)
+    spread.update(0)
+
+    np.testing.assert_allclose(spread.get(), direct.get())
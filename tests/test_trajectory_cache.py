@@ -0,0 +1,146 @@
+import numpy as np
+
+from strange_attractors.attractors import LorenzAttractor, ThomasAttractor
+from strange_attractors.configs.attractor_config import AttractorConfig, SimSettings
+from strange_attractors.solvers.newton import NewtonSolver
+from strange_attractors.utils.trajectory_cache import TrajectoryCache
+from strange_attractors.visu.visu import Visualizer
+
+
+def test_trajectory_cache_hit(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    solver = NewtonSolver(LorenzAttractor())
+    state = np.array([[1.0, 1.0, 1.0]])
+
+    first = cache.solve(solver, state, n_steps=100, dt=0.01)
+    second = cache.solve(solver, state, n_steps=100, dt=0.01)
+
+    np.testing.assert_allclose(first, solver.solve(state, n_steps=100, dt=0.01))
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+
+def test_trajectory_cache_key():
+    cache = TrajectoryCache()
+    state = np.array([[1.0, 1.0, 1.0]])
+    key = cache.key(NewtonSolver(ThomasAttractor()), state, 100, 0.01)
+
+    assert key == cache.key(NewtonSolver(ThomasAttractor()), state.copy(), 100, 0.01)
+    assert key != cache.key(NewtonSolver(ThomasAttractor(a=0.2)), state, 100, 0.01)
+    assert key != cache.key(NewtonSolver(LorenzAttractor()), state, 100, 0.01)
+    assert key != cache.key(NewtonSolver(ThomasAttractor()), state + 1, 100, 0.01)
+    assert key != cache.key(NewtonSolver(ThomasAttractor()), state, 101, 0.01)
+    assert key != cache.key(NewtonSolver(ThomasAttractor()), state, 100, 0.02)
+
+
+def test_trajectory_cache_eviction(tmp_path):
+    solver = NewtonSolver(LorenzAttractor())
+    states = [np.array([[float(i), 1.0, 1.0]]) for i in range(3)]
+    # Each trajectory takes 100 * 3 * 8 = 2400 bytes plus a 128 byte header
+    previous_run = TrajectoryCache(tmp_path, max_bytes=6000)
+    for state in states[:2]:
+        previous_run.solve(solver, state, n_steps=100, dt=0.01)
+
+    cache = TrajectoryCache(tmp_path, max_bytes=6000)
+    cache.solve(solver, states[2], n_steps=100, dt=0.01)
+
+    keys = [cache.key(solver, state, 100, 0.01) for state in states]
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_trajectory_cache_cyclic_access(tmp_path):
+    # Five configs visited in the same order twice, but only three fit
+    cache = TrajectoryCache(tmp_path, max_bytes=3 * 2600)
+    solver = NewtonSolver(LorenzAttractor())
+    states = [np.array([[float(i), 1.0, 1.0]]) for i in range(5)]
+    for state in states:
+        cache.solve(solver, state, n_steps=100, dt=0.01)
+
+    keys = [cache.key(solver, state, 100, 0.01) for state in states]
+    hits = [cache.get(key) is not None for key in keys]
+    expected_hits = 3
+    assert sum(hits) == expected_hits
+    # The next run hits the same entries again
+    next_run = TrajectoryCache(tmp_path, max_bytes=3 * 2600)
+    for state in states:
+        next_run.solve(solver, state, n_steps=100, dt=0.01)
+    assert [next_run.get(key) is not None for key in keys] == hits
+
+
+def test_trajectory_cache_oversized(tmp_path):
+    solver = NewtonSolver(LorenzAttractor())
+    state = np.array([[1.0, 1.0, 1.0]])
+    TrajectoryCache(tmp_path, max_bytes=3000).solve(solver, state, n_steps=100, dt=0.01)
+
+    cache = TrajectoryCache(tmp_path, max_bytes=3000)
+    result = cache.solve(solver, state + 1, n_steps=1000, dt=0.01)
+
+    np.testing.assert_allclose(result, solver.solve(state + 1, n_steps=1000, dt=0.01))
+    assert not isinstance(result, np.memmap)
+    # The entry that fits was not evicted for the one that does not
+    assert cache.get(cache.key(solver, state, 100, 0.01)) is not None
+    assert len(list(tmp_path.glob("*"))) == 1
+
+
+def test_trajectory_cache_version(tmp_path):
+    solver = NewtonSolver(LorenzAttractor())
+    state = np.array([[1.0, 1.0, 1.0]])
+    TrajectoryCache(tmp_path, version="1").solve(solver, state, n_steps=100, dt=0.01)
+
+    cache = TrajectoryCache(tmp_path, version="2")
+    assert cache.get(cache.key(solver, state, 100, 0.01)) is None
+
+
+def test_trajectory_cache_key_array_fields():
+    cache = TrajectoryCache()
+    state = np.array([[1.0, 1.0, 1.0]])
+    values = np.linspace(0.1, 0.2, 2000)
+    changed = values.copy()
+    # Differs only in the part numpy's repr truncates
+    changed[1000] += 1e-3
+    key = cache.key(NewtonSolver(ThomasAttractor(a=values)), state, 100, 0.01)
+
+    assert key is not None
+    assert key == cache.key(NewtonSolver(ThomasAttractor(a=values.copy())), state, 100, 0.01)
+    assert key != cache.key(NewtonSolver(ThomasAttractor(a=changed)), state, 100, 0.01)
+    assert cache.key(NewtonSolver(ThomasAttractor(a=object())), state, 100, 0.01) is None
+
+
+def test_attractor_config_cached(tmp_path):
+    def make_config(trajectory_cache):
+        settings = SimSettings(
+            dt=0.03,
+            num_particles=3,
+            fast_start=True,
+            ring_buffer_size=500,
+            seed=1,
+            trajectory_cache=trajectory_cache,
+        )
+        return AttractorConfig(ThomasAttractor(), Visualizer, settings)
+
+    cache = TrajectoryCache(tmp_path)
+    uncached = make_config(None)
+    for _ in range(2):  # Cache miss, then cache hit
+        cached = make_config(cache)
+        np.testing.assert_array_equal(cached.starting_state, uncached.starting_state)
+        np.testing.assert_array_equal(cached.buffered_solver.get(), uncached.buffered_solver.get())
+
+    np.testing.assert_array_equal(
+        cached.buffered_solver.update(10), uncached.buffered_solver.update(10)
+    )
+
+
+def test_attractor_config_seed_keeps_global_rng():
+    np.random.seed(123)
+    expected = np.random.rand(3)
+
+    np.random.seed(123)
+    AttractorConfig(
+        ThomasAttractor(),
+        Visualizer,
+        SimSettings(num_particles=2, n_steps=10, ring_buffer_size=10, seed=0),
+    )
+    np.testing.assert_array_equal(np.random.rand(3), expected)